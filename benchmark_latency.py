@@ -1,10 +1,9 @@
 import asyncio
+import re
 import time
 import logging
 import os
-import json
-import numpy as np
-import soundfile as sf
+import httpx
 from dotenv import load_dotenv
 from elevenlabs.client import AsyncElevenLabs
 from groq import AsyncGroq
@@ -17,64 +16,161 @@ logger = logging.getLogger("Benchmark")
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
+# Sentence flush rules for the LLM -> TTS pipeline
+SENTENCE_END = re.compile(r'[.!?]\s')
+ABBREVIATIONS = {"Dr.", "Mr.", "Mrs.", "PM."}
+MIN_SENTENCE_LEN = 10
+
 async def benchmark_pipeline():
     """Simulates the pipeline flow and measures latency of each component."""
-    
+
     logger.info("--- STARTING LATENCY BENCHMARK ---")
 
     # 1. Simulating Audio Capture (Pre-recorded dummy)
-    # Generate 3 seconds of "silence/noise" just to have a buffer, 
-    # but for Scribe to work we actually need speech. 
+    # Generate 3 seconds of "silence/noise" just to have a buffer,
+    # but for Scribe to work we actually need speech.
     # Since we can't speak into CI, we will use a text input to test TTS/LLM parts specifically
     # or rely on a real test file if present. assuming 'test_audio.wav' does not exist,
     # we will focus on LLM + TTS Latency (The output side).
-    
+
     text_input = "Hello, how are you doing today? I am testing the system latency."
     target_lang = "Urdu"
-    
-    # --- LLM BENCHMARK ---
-    logger.info(f"Step 1: LLM Translation ({text_input} -> {target_lang})")
-    groq = AsyncGroq(api_key=GROQ_API_KEY)
-    
-    t0 = time.time()
-    chat = await groq.chat.completions.create(
+
+    # One shared pool for both SDKs: TLS/ALPN/HTTP2 setup is paid once and
+    # every later call reuses a warm stream.
+    shared_http = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20)
+    )
+
+    # Build both clients up front so the TTS connection can warm up
+    # while the LLM call is in flight.
+    groq = AsyncGroq(api_key=GROQ_API_KEY, http_client=shared_http)
+    el_client = AsyncElevenLabs(api_key=ELEVENLABS_API_KEY, httpx_client=shared_http)
+
+    # Pre-open connections to both hosts so TTFB measures the request, not the handshake
+    for host in ("https://api.groq.com", "https://api.elevenlabs.io"):
+        try:
+            await shared_http.get(host, timeout=5)
+        except Exception:
+            pass  # Any response (even 404) is fine - the connection is open now
+
+    async def tts_warmup():
+        """Opens the ElevenLabs connection (TCP+TLS+auth) with a throwaway request."""
+        try:
+            warmup_stream = el_client.text_to_speech.convert(
+                text=".",
+                voice_id="21m00Tcm4TlvDq8ikWAM",
+                model_id="eleven_turbo_v2_5",
+                output_format="pcm_16000"
+            )
+            async for _ in warmup_stream:
+                break  # First chunk is enough, connection is hot now
+        except Exception as e:
+            logger.warning(f"TTS warmup failed (continuing cold): {e}")
+
+    async def tts_stream(sentence):
+        """Streams one sentence to TTS; returns (first_chunk_ns, total_bytes)."""
+        audio_stream = el_client.text_to_speech.convert(
+            text=sentence,
+            voice_id="21m00Tcm4TlvDq8ikWAM",
+            model_id="eleven_turbo_v2_5",
+            output_format="pcm_16000"
+        )
+        first_chunk_ns = None
+        total_bytes = 0
+        async for chunk in audio_stream:
+            if first_chunk_ns is None:
+                first_chunk_ns = time.perf_counter_ns()
+            total_bytes += len(chunk)
+        return first_chunk_ns, total_bytes
+
+    # --- PIPELINED LLM -> TTS BENCHMARK ---
+    # Stream the Groq completion and fire TTS at each sentence boundary so
+    # synthesis overlaps with the remaining LLM generation.
+    # (JSON mode is dropped here: it disables useful streaming.)
+    logger.info(f"Step 1+2: Streamed LLM Translation -> Sentence-Pipelined TTS ({text_input} -> {target_lang})")
+
+    warmup_task = asyncio.create_task(tts_warmup())
+
+    t0 = time.perf_counter_ns()
+    completion = await groq.chat.completions.create(
         messages=[
-            {"role": "system", "content": "Output JSON: {\"translation\": \"...\"}"}, 
+            {"role": "system", "content": "You are a professional translator. Output ONLY the translated text."},
             {"role": "user", "content": f"Translate to {target_lang}: {text_input}"}
         ],
         model="llama-3.1-8b-instant",
-        response_format={"type": "json_object"}
+        stream=True
     )
-    t1 = time.time()
-    content = json.loads(chat.choices[0].message.content)
-    translated_text = content.get("translation")
-    logger.info(f"✅ LLM Latency: {(t1-t0)*1000:.2f}ms")
-    logger.info(f"Translation: {translated_text}")
-    
-    # --- TTS BENCHMARK (Current Buffer Approach) ---
-    logger.info(f"Step 2: TTS Generation (Buffered) - ElevenLabs Turbo v2.5")
-    el_client = AsyncElevenLabs(api_key=ELEVENLABS_API_KEY)
-    
-    t2 = time.time()
-    audio_stream = await el_client.text_to_speech.convert(
-        text=translated_text,
-        voice_id="21m00Tcm4TlvDq8ikWAM",
-        model_id="eleven_turbo_v2_5",
-        output_format="mp3_44100_128"
-    )
-    # Convert returns bytes directly (non-streaming simulation)
-    first_byte_time = time.time()
-    total_bytes = len(audio_stream)
-        
-    t3 = time.time()
-    
-    ttfb = (first_byte_time - t2) * 1000 if first_byte_time else 0
-    total_dur = (t3 - t2) * 1000
-    
-    logger.info(f"✅ TTS Time-To-First-Byte (TTFB): {ttfb:.2f}ms")
-    logger.info(f"✅ TTS Total Download Time: {total_dur:.2f}ms")
+
+    # Preserves playback order: TTS tasks are awaited in the sequence the
+    # sentences were flushed.
+    tts_tasks = asyncio.Queue()
+    buffer = ""
+    full_text = ""
+    t_first_token = None
+
+    def should_flush(buf):
+        match = SENTENCE_END.search(buf)
+        if not match:
+            return None
+        end = match.end()
+        head = buf[:end].rstrip()
+        if len(head) < MIN_SENTENCE_LEN:
+            return None
+        if any(head.endswith(abbr) for abbr in ABBREVIATIONS):
+            return None
+        return end
+
+    async for chunk in completion:
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+        if t_first_token is None:
+            t_first_token = time.perf_counter_ns()
+        buffer += delta
+        full_text += delta
+        end = should_flush(buffer)
+        if end is not None:
+            sentence = buffer[:end].strip()
+            buffer = buffer[end:]
+            tts_tasks.put_nowait(asyncio.create_task(tts_stream(sentence)))
+
+    t1 = time.perf_counter_ns()
+
+    # Flush any trailing partial sentence
+    if buffer.strip():
+        tts_tasks.put_nowait(asyncio.create_task(tts_stream(buffer.strip())))
+
+    logger.info(f"✅ LLM First Token: {(t_first_token - t0) // 1_000_000 if t_first_token else 0}ms")
+    logger.info(f"✅ LLM Full Generation: {(t1 - t0) // 1_000_000}ms")
+    logger.info(f"Translation: {full_text.strip()}")
+
+    # Await TTS tasks in flush order (playback sequence)
+    first_audio_ns = None
+    total_bytes = 0
+    sentence_idx = 0
+    while not tts_tasks.empty():
+        task = await tts_tasks.get()
+        first_chunk_ns, sent_bytes = await task
+        sentence_idx += 1
+        total_bytes += sent_bytes
+        if first_chunk_ns is not None:
+            if first_audio_ns is None:
+                first_audio_ns = first_chunk_ns
+            logger.info(f"   Sentence {sentence_idx} TTS first byte: +{(first_chunk_ns - t0) // 1_000_000}ms from start")
+
+    t3 = time.perf_counter_ns()
+
+    ttfa = (first_audio_ns - t0) // 1_000_000 if first_audio_ns else 0
+    total_dur = (t3 - t0) // 1_000_000
+
+    logger.info(f"✅ Time-To-First-Audio (LLM start -> first TTS byte): {ttfa}ms")
+    logger.info(f"✅ Pipeline Total: {total_dur}ms")
     logger.info(f"Total Bytes: {total_bytes}")
-    
+
+    await warmup_task
+    await shared_http.aclose()
     logger.info("--- BENCHMARK COMPLETE ---")
 
 if __name__ == "__main__":
@@ -2,7 +2,6 @@ import asyncio
 import time
 import logging
 import os
-import numpy as np
 from dotenv import load_dotenv
 from elevenlabs.client import AsyncElevenLabs
 
@@ -18,44 +17,51 @@ async def benchmark_streaming_tts():
     
     text_input = "This is a test of the ultra low latency streaming capability of the system."
     voice_id = "21m00Tcm4TlvDq8ikWAM"
-    model_id = "eleven_turbo_v2_5"
+    model_id = "eleven_flash_v2_5"  # Flash has a lower TTFB floor than Turbo
     
     el_client = AsyncElevenLabs(api_key=ELEVENLABS_API_KEY)
     
     logger.info(f"Target Text: '{text_input}'")
     logger.info(f"Model: {model_id}")
     
-    t_start = time.time()
+    t_start = time.perf_counter_ns()
     
     # Request PCM 16000 Stream (No await)
+    # optimize_streaming_latency (0-4) trades quality for first-chunk time.
+    # PCM avoids MP3 frame-alignment padding on the first audible output.
     audio_stream = el_client.text_to_speech.convert(
         text=text_input,
         voice_id=voice_id,
         model_id=model_id,
-        output_format="pcm_16000"
+        output_format="pcm_16000",
+        optimize_streaming_latency=3
     )
     
     first_chunk = True
     chunk_count = 0
     total_bytes = 0
     ttfb = 0
-    
+
+    # Pre-bind hot names: small PCM chunks arrive fast enough that
+    # per-iteration attribute lookups are measurable.
+    perf = time.perf_counter_ns
+
     logger.info("request sent... waiting for first byte...")
-    
+
     async for chunk in audio_stream:
         if first_chunk:
-            t_first = time.time()
-            ttfb = (t_first - t_start) * 1000
-            logger.info(f"✅ TTFB (Time To First Byte): {ttfb:.2f}ms")
+            t_first = perf()
+            ttfb = (t_first - t_start) // 1_000_000
+            logger.info(f"✅ TTFB (Time To First Byte): {ttfb}ms")
             first_chunk = False
-            
+
         chunk_count += 1
         total_bytes += len(chunk)
-        
-    t_end = time.time()
-    total_dur = (t_end - t_start) * 1000
-    
-    logger.info(f"✅ Total Download Time: {total_dur:.2f}ms")
+
+    t_end = perf()
+    total_dur = (t_end - t_start) // 1_000_000
+
+    logger.info(f"✅ Total Download Time: {total_dur}ms")
     logger.info(f"Total Chunks: {chunk_count}")
     logger.info(f"Total Bytes: {total_bytes}")
     
@@ -66,5 +72,54 @@ async def benchmark_streaming_tts():
     else:
         logger.info("\n⚠️ RESULT: HIGH LATENCY (> 1000ms)")
 
+async def benchmark_input_streaming_tts():
+    """Benchmarks the WebSocket input-streaming endpoint.
+
+    Feeds the prompt word-by-word through an async generator so synthesis
+    starts before the full text is known - the same shape as piping LLM
+    token deltas straight into TTS.
+    """
+    logger.info("--- ⚡ BENCHMARKING INPUT-STREAMING (WebSocket) TTS LATENCY ⚡ ---")
+
+    text_input = "This is a test of the ultra low latency streaming capability of the system."
+    voice_id = "21m00Tcm4TlvDq8ikWAM"
+    model_id = "eleven_flash_v2_5"
+
+    el_client = AsyncElevenLabs(api_key=ELEVENLABS_API_KEY)
+
+    async def text_stream():
+        # Word-sized chunks; in the real pipeline these come from Groq token deltas
+        for word in text_input.split(" "):
+            yield word + " "
+
+    if not hasattr(el_client.text_to_speech, "convert_realtime"):
+        logger.warning("⚠️ SDK has no convert_realtime (input streaming) endpoint. Skipping.")
+        return
+
+    t_start = time.perf_counter_ns()
+
+    audio_stream = el_client.text_to_speech.convert_realtime(
+        text=text_stream(),
+        voice_id=voice_id,
+        model_id=model_id,
+        output_format="pcm_16000"
+    )
+
+    first_chunk = True
+    total_bytes = 0
+    perf = time.perf_counter_ns
+
+    async for chunk in audio_stream:
+        if first_chunk:
+            ttfb = (perf() - t_start) // 1_000_000
+            logger.info(f"✅ TTFB (Input Streaming): {ttfb}ms")
+            first_chunk = False
+        total_bytes += len(chunk)
+
+    total_dur = (perf() - t_start) // 1_000_000
+    logger.info(f"✅ Total Duration: {total_dur}ms")
+    logger.info(f"Total Bytes: {total_bytes}")
+
 if __name__ == "__main__":
     asyncio.run(benchmark_streaming_tts())
+    asyncio.run(benchmark_input_streaming_tts())
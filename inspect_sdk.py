@@ -1,16 +1,23 @@
 
 import asyncio
-from elevenlabs.client import AsyncElevenLabs
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 async def inspect():
+    if not os.getenv("ELEVENLABS_API_KEY"):
+        print("ELEVENLABS_API_KEY not set; nothing to inspect.")
+        return
+
+    # Imported here so merely importing this module (e.g. test discovery)
+    # doesn't pay for the SDK.
+    from elevenlabs.client import AsyncElevenLabs
+
     client = AsyncElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
     print("Methods of text_to_speech client:")
     print(dir(client.text_to_speech))
-    
+
     print("\nDocstring of speech_to_text.convert:")
     print(client.speech_to_text.convert.__doc__)
 
@@ -1,18 +1,28 @@
 import customtkinter as ctk
-import sounddevice as sd
 import threading
 import asyncio
 import logging
-import queue
 import json
 import os
-from dotenv import load_dotenv
-from translation_engine import TranslationEngine
+import re
+from collections import deque
+
+# Heavy modules (sounddevice loads the PortAudio DLL; translation_engine
+# drags in the groq/elevenlabs/numpy stack) are imported lazily so the
+# window paints before any of them initialize.
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 CONFIG_FILE = "config.json"
+DEVICE_CACHE_FILE = "device_cache.json"
+DEVICE_CACHE_MAX_AGE = 3600  # seconds
+
+# Pattern: [SENDER/RECEIVER] Original: ... -> Translated: ...
+_CHAT_RE = re.compile(r"\[(SENDER|RECEIVER)\] Original: (.*?) -> Translated: (.*)")
+
+LOG_DRAIN_BATCH = 64    # max messages pulled per tick
+LOG_MAX_LINES = 500     # keep only the newest lines in the log console
 
 # Appearance
 ctk.set_appearance_mode("Dark")
@@ -26,8 +36,17 @@ class App(ctk.CTk):
         self.geometry("700x750")
         
         self.engine = None
-        self.engine_thread = None
-        self.log_queue = queue.Queue()
+        self.receiver_engine = None
+        # deque: atomic appends from producer threads, no lock or condition
+        # variable overhead on every log line
+        self.log_queue = deque()
+
+        # One shared asyncio loop thread hosts both engines, so they share
+        # connection pools instead of running two loops on two threads.
+        self._loop = None
+        self._loop_thread = None
+
+        self._save_timer = None  # Debounce handle for save_settings
         
         # Grid Layout
         self.grid_columnconfigure(0, weight=1)
@@ -55,9 +74,20 @@ class App(ctk.CTk):
         self.frame_devices.grid(row=1, column=0, padx=20, pady=10, sticky="ew")
         self.frame_devices.grid_columnconfigure(1, weight=1)
         
-        # Get Devices
-        self.input_devices, self.output_devices = self._get_audio_devices()
-        
+        # Get Devices (cached: sd.query_devices() can block for over a second
+        # on Windows, so avoid it on the UI thread when a fresh cache exists)
+        self.input_devices, self.output_devices = self._load_device_cache()
+        if self.input_devices is None:
+            # First run (or stale cache): pay the cost once, synchronously
+            self.input_devices, self.output_devices = self._get_audio_devices()
+            self._save_device_cache()
+        else:
+            # Refresh in the background in case devices changed
+            threading.Thread(target=self._refresh_devices, daemon=True).start()
+
+        # Label tuples and one name->id map, computed once per enumeration
+        self._rebuild_device_index()
+
         self.input_device_id = ctk.IntVar(value=-1)
         self.output_device_id = ctk.IntVar(value=-1)
         self.recv_input_device_id = ctk.IntVar(value=-1)
@@ -65,32 +95,32 @@ class App(ctk.CTk):
         
         # --- Sender Config (You -> Them) ---
         ctk.CTkLabel(self.frame_devices, text="[SENDER] Your Mic:").grid(row=0, column=0, padx=10, pady=5, sticky="w")
-        self.opt_input = ctk.CTkOptionMenu(self.frame_devices, values=list(self.input_devices.keys()), command=self._update_input_id)
+        self.opt_input = ctk.CTkOptionMenu(self.frame_devices, values=list(self._input_labels), command=self._update_input_id)
         self.opt_input.grid(row=0, column=1, padx=10, pady=5, sticky="ew")
         
         ctk.CTkLabel(self.frame_devices, text="[SENDER] Output (Virt Cable):").grid(row=1, column=0, padx=10, pady=5, sticky="w")
-        self.opt_output = ctk.CTkOptionMenu(self.frame_devices, values=list(self.output_devices.keys()), command=self._update_output_id)
+        self.opt_output = ctk.CTkOptionMenu(self.frame_devices, values=list(self._output_labels), command=self._update_output_id)
         self.opt_output.grid(row=1, column=1, padx=10, pady=5, sticky="ew")
 
         # --- Receiver Config (Them -> You) ---
         ctk.CTkLabel(self.frame_devices, text="[RECEIVER] Their Audio (Stereo Mix):").grid(row=2, column=0, padx=10, pady=5, sticky="w")
-        self.opt_recv_input = ctk.CTkOptionMenu(self.frame_devices, values=list(self.input_devices.keys()), command=self._update_recv_input_id)
+        self.opt_recv_input = ctk.CTkOptionMenu(self.frame_devices, values=list(self._input_labels), command=self._update_recv_input_id)
         self.opt_recv_input.grid(row=2, column=1, padx=10, pady=5, sticky="ew")
 
         ctk.CTkLabel(self.frame_devices, text="[RECEIVER] Play to (Headphones):").grid(row=3, column=0, padx=10, pady=5, sticky="w")
-        self.opt_recv_output = ctk.CTkOptionMenu(self.frame_devices, values=list(self.output_devices.keys()), command=self._update_recv_output_id)
+        self.opt_recv_output = ctk.CTkOptionMenu(self.frame_devices, values=list(self._output_labels), command=self._update_recv_output_id)
         self.opt_recv_output.grid(row=3, column=1, padx=10, pady=5, sticky="ew")
         
         # Set defaults (will be overwritten by load_settings if available)
-        if self.input_devices:
-            in_key = list(self.input_devices.keys())[0]
+        if self._input_labels:
+            in_key = self._input_labels[0]
             self.opt_input.set(in_key)
             self.opt_recv_input.set(in_key)
             self._update_input_id(in_key)
             self._update_recv_input_id(in_key)
-            
-        if self.output_devices:
-            out_key = list(self.output_devices.keys())[0]
+
+        if self._output_labels:
+            out_key = self._output_labels[0]
             self.opt_output.set(out_key)
             self.opt_recv_output.set(out_key)
             self._update_output_id(out_key)
@@ -118,10 +148,6 @@ class App(ctk.CTk):
         self.opt_tgt_lang.set("Urdu")
         
         # --- Section 4: Controls ---
-        self.btn_start = ctk.CTkButton(self, text="START DUAL TRANSLATION", fg_color="green", height=50, command=self.start_translation)
-        self.btn_start.grid(row=3, column=0, padx=20, pady=10, sticky="ew")
-        
-        self.btn_stop = ctk.CTkButton(self, text="STOP", fg_color="red", command=self.stop_translation, state="disabled")
         self.frame_controls = ctk.CTkFrame(self)
         self.frame_controls.grid(row=3, column=0, padx=20, pady=10, sticky="ew")
         self.frame_controls.grid_columnconfigure((0,1), weight=1)
@@ -144,12 +170,14 @@ class App(ctk.CTk):
         self.tab_chat = self.tabview.add("Live Chat")
         self.tab_logs = self.tabview.add("Debug Logs")
         
-        # Chat Area
+        # Chat Area (single textbox transcript: per-message CTk widget trees
+        # made scrolling stall after a few hundred messages)
         self.tab_chat.grid_columnconfigure(0, weight=1)
         self.tab_chat.grid_rowconfigure(0, weight=1)
-        self.chat_frame = ctk.CTkScrollableFrame(self.tab_chat, fg_color="transparent")
-        self.chat_frame.grid(row=0, column=0, sticky="nsew")
-        self.chat_frame.grid_columnconfigure(0, weight=1)
+        self.chat_box = ctk.CTkTextbox(self.tab_chat, state="disabled", wrap="word", font=("Arial", 14))
+        self.chat_box.grid(row=0, column=0, sticky="nsew")
+        self.chat_box.tag_config("sender", justify="right", foreground="#6db3e8")
+        self.chat_box.tag_config("receiver", justify="left", foreground="#d0d0d0")
         
         # Logs Area
         self.tab_logs.grid_columnconfigure(0, weight=1)
@@ -158,44 +186,93 @@ class App(ctk.CTk):
         self.textbox_log.grid(row=0, column=0, sticky="nsew")
         
         self.load_settings() # Load saved config
-        
-        self.after(100, self._process_logs)
+
+        # Event-driven log flushing: producers fire <<LogMsg>> after each put,
+        # so there are no idle 100 ms polling wakeups and no display lag.
+        self.bind("<<LogMsg>>", self._process_logs)
 
     # ... [Device Methods Remain Unchanged] ...
 
+    def _load_device_cache(self):
+        """Returns cached (inputs, outputs) if fresh enough, else (None, None)."""
+        try:
+            if os.path.exists(DEVICE_CACHE_FILE):
+                import time
+                if time.time() - os.path.getmtime(DEVICE_CACHE_FILE) < DEVICE_CACHE_MAX_AGE:
+                    with open(DEVICE_CACHE_FILE, "r") as f:
+                        cache = json.load(f)
+                    return cache["inputs"], cache["outputs"]
+        except Exception as e:
+            print(f"Error reading device cache: {e}")
+        return None, None
+
+    def _save_device_cache(self):
+        try:
+            with open(DEVICE_CACHE_FILE, "w") as f:
+                json.dump({"inputs": self.input_devices, "outputs": self.output_devices}, f)
+        except Exception as e:
+            print(f"Error writing device cache: {e}")
+
+    def _refresh_devices(self):
+        """Worker thread: re-enumerates devices and updates the UI if they changed."""
+        inputs, outputs = self._get_audio_devices()
+        if inputs == self.input_devices and outputs == self.output_devices:
+            return
+        self.after(0, lambda: self._apply_devices(inputs, outputs))
+
+    def _apply_devices(self, inputs, outputs):
+        self.input_devices = inputs
+        self.output_devices = outputs
+        self._rebuild_device_index()
+        self._save_device_cache()
+        self.opt_input.configure(values=list(self._input_labels))
+        self.opt_recv_input.configure(values=list(self._input_labels))
+        self.opt_output.configure(values=list(self._output_labels))
+        self.opt_recv_output.configure(values=list(self._output_labels))
+        self.log("Audio device list refreshed.")
+
     def _get_audio_devices(self):
-        inputs = {}
-        outputs = {}
+        import sounddevice as sd
         try:
-            device_info = sd.query_devices()
-            for i, d in enumerate(device_info):
-                name = f"{i}: {d['name']}"
-                if d['max_input_channels'] > 0:
-                    inputs[name] = i
-                if d['max_output_channels'] > 0:
-                    outputs[name] = i
+            devs = sd.query_devices()
         except Exception as e:
             print(f"Error querying devices: {e}")
+            return {}, {}
+        inputs = {f"{i}: {d['name']}": i for i, d in enumerate(devs) if d['max_input_channels'] > 0}
+        outputs = {f"{i}: {d['name']}": i for i, d in enumerate(devs) if d['max_output_channels'] > 0}
         return inputs, outputs
 
+    def _rebuild_device_index(self):
+        """Precomputes label tuples and the combined name->id lookup."""
+        self._input_labels = tuple(self.input_devices.keys())
+        self._output_labels = tuple(self.output_devices.keys())
+        self._id_map = {**self.input_devices, **self.output_devices}
+
     def _update_input_id(self, choice):
-        if choice in self.input_devices:
-            self.input_device_id.set(self.input_devices[choice])
+        if choice in self._id_map:
+            self.input_device_id.set(self._id_map[choice])
 
     def _update_output_id(self, choice):
-        if choice in self.output_devices:
-            self.output_device_id.set(self.output_devices[choice])
-        
+        if choice in self._id_map:
+            self.output_device_id.set(self._id_map[choice])
+
     def _update_recv_input_id(self, choice):
-        if choice in self.input_devices:
-            self.recv_input_device_id.set(self.input_devices[choice])
+        if choice in self._id_map:
+            self.recv_input_device_id.set(self._id_map[choice])
 
     def _update_recv_output_id(self, choice):
-        if choice in self.output_devices:
-            self.recv_output_device_id.set(self.output_devices[choice])
+        if choice in self._id_map:
+            self.recv_output_device_id.set(self._id_map[choice])
             
     def save_settings(self):
-        """Saves current configuration to file."""
+        """Schedules a debounced, background save of the current configuration."""
+        if self._save_timer is not None:
+            self.after_cancel(self._save_timer)
+        self._save_timer = self.after(200, self._do_save)
+
+    def _do_save(self):
+        self._save_timer = None
+        # Read the widgets on the UI thread; write the file off it
         config = {
             "api_key_groq": self.api_key_groq.get(),
             "api_key_elevenlabs": self.api_key_elevenlabs.get(),
@@ -206,17 +283,24 @@ class App(ctk.CTk):
             "source_lang": self.opt_src_lang.get(),
             "target_lang": self.opt_tgt_lang.get()
         }
-        try:
-            with open(CONFIG_FILE, "w") as f:
-                json.dump(config, f)
-            self.log("Settings saved.")
-        except Exception as e:
-            self.log(f"Error saving settings: {e}")
+
+        def write():
+            try:
+                tmp = CONFIG_FILE + ".tmp"
+                with open(tmp, "w") as f:
+                    json.dump(config, f)
+                os.replace(tmp, CONFIG_FILE)  # Atomic: no partial config on crash
+                self.log("Settings saved.")
+            except Exception as e:
+                self.log(f"Error saving settings: {e}")
+
+        threading.Thread(target=write, daemon=True).start()
 
     def load_settings(self):
         """Loads configuration from file."""
         if not os.path.exists(CONFIG_FILE):
             # Try loading env vars if config doesn't exist
+            from dotenv import load_dotenv
             load_dotenv()
             self.api_key_groq.set(os.getenv("GROQ_API_KEY", ""))
             self.api_key_elevenlabs.set(os.getenv("ELEVENLABS_API_KEY", ""))
@@ -249,66 +333,59 @@ class App(ctk.CTk):
             self.log(f"Error loading settings: {e}")
 
     def log(self, message):
-        self.log_queue.put(str(message) + "\n")
+        self.log_queue.append(str(message) + "\n")
+        try:
+            # Thread-safe in Tcl/Tk >= 8.6; "tail" keeps ordering with UI events
+            self.event_generate("<<LogMsg>>", when="tail")
+        except Exception:
+            # Fallback if the platform's Tk rejects cross-thread events
+            self.after(0, self._process_logs)
 
-    def _process_logs(self):
-        import re
-        while not self.log_queue.empty():
-            msg = self.log_queue.get()
-            
-            # 1. Update Log Console
+    def _process_logs(self, event=None):
+        # Drain a bounded batch so one slow tick can't starve the UI
+        batch = []
+        q = self.log_queue
+        while q and len(batch) < LOG_DRAIN_BATCH:
+            batch.append(q.popleft())
+
+        if batch:
+            # 1. Update Log Console (one insert for the whole batch)
             self.textbox_log.configure(state="normal")
-            self.textbox_log.insert("end", msg)
+            self.textbox_log.insert("end", "".join(batch))
+            # Keep the widget bounded: drop everything older than the cap so
+            # memory and repaint cost stay O(1) over a long session
+            line_count = int(self.textbox_log.index("end-1c").split(".")[0])
+            if line_count > LOG_MAX_LINES:
+                self.textbox_log.delete("1.0", f"{line_count - LOG_MAX_LINES}.0")
             self.textbox_log.see("end")
             self.textbox_log.configure(state="disabled")
-            
+
             # 2. Update Chat UI (Parse Translation Logs)
-            # Pattern: [SENDER/RECEIVER] Original: ... -> Translated: ...
-            match = re.search(r"\[(SENDER|RECEIVER)\] Original: (.*?) -> Translated: (.*)", msg)
-            if match:
-                role = match.group(1)
-                original = match.group(2)
-                translated = match.group(3)
-                is_sender = (role == "SENDER")
-                
-                self.add_chat_bubble(original, translated, is_sender)
+            for msg in batch:
+                if "Original:" not in msg:
+                    continue
+                match = _CHAT_RE.search(msg)
+                if match:
+                    role = match.group(1)
+                    original = match.group(2)
+                    translated = match.group(3)
+                    is_sender = (role == "SENDER")
+
+                    self.add_chat_bubble(original, translated, is_sender)
 
-        self.after(100, self._process_logs)
+        # If a burst left more than one batch queued, keep draining
+        if self.log_queue:
+            self.after(0, self._process_logs)
 
     def add_chat_bubble(self, original, translated, is_sender):
-        # Container Frame
-        frame = ctk.CTkFrame(self.chat_frame, fg_color="transparent")
-        frame.pack(fill="x", pady=5, padx=10)
-        
-        # Bubble Color & Alignment
-        if is_sender:
-            color = "#1f6aa5" # Blue-ish for You
-            anchor = "e" # East/Right
-            align = "right"
-            speaker_label = "You"
-            col_cfg = (1, 0) # Spacer left, bubble right
-        else:
-            color = "#2b2b2b" # Dark Gray for Them
-            anchor = "w" # West/Left
-            align = "left"
-            speaker_label = "Them"
-            col_cfg = (0, 1) # Bubble left, spacer right
-            
-        # Grid layout for alignment
-        frame.grid_columnconfigure(0, weight=col_cfg[0])
-        frame.grid_columnconfigure(1, weight=col_cfg[1])
-        
-        # Actual Bubble
-        bubble = ctk.CTkFrame(frame, fg_color=color, corner_radius=15)
-        bubble.grid(row=0, column=0 if not is_sender else 1, sticky=anchor)
-        
-        # Text
-        content = f"{original}\n⬇\n{translated}"
-        label = ctk.CTkLabel(bubble, text=content, text_color="white", justify=align, wraplength=400, font=("Arial", 14))
-        label.pack(padx=15, pady=10)
-        
-        # Scroll to bottom
-        self.chat_frame._parent_canvas.yview_moveto(1.0)
+        speaker_label = "You" if is_sender else "Them"
+        tag = "sender" if is_sender else "receiver"
+
+        content = f"{speaker_label}: {original}\n⬇\n{translated}\n\n"
+        self.chat_box.configure(state="normal")
+        self.chat_box.insert("end", content, (tag,))
+        self.chat_box.see("end")
+        self.chat_box.configure(state="disabled")
 
     def start_translation(self):
         self.save_settings() # Auto-save on start
@@ -320,7 +397,12 @@ class App(ctk.CTk):
             self.log("ERROR: API Keys are required!")
             return
             
-        keys = {"GROQ_API_KEY": groq_key, "ELEVENLABS_API_KEY": el_key}
+        keys = {
+            "GROQ_API_KEY": groq_key,
+            "ELEVENLABS_API_KEY": el_key,
+            # Optional: enables the streaming STT path in the engine
+            "DEEPGRAM_API_KEY": os.getenv("DEEPGRAM_API_KEY", "")
+        }
         
         # Sender Config
         in_dev = self.input_device_id.get()
@@ -347,9 +429,30 @@ class App(ctk.CTk):
             self.progressbar.set(level)
 
         # GLOBAL INTERLOCK (Prevents ANY listening while ANYONE is speaking)
-        import threading
         self.speech_interlock = threading.Event()
 
+        # Deferred import: only pay for the engine stack once translation starts
+        from translation_engine import TranslationEngine
+        from groq import AsyncGroq
+        from elevenlabs.client import AsyncElevenLabs
+        import httpx
+
+        # One HTTP/2 pool under both providers: a single TLS handshake per
+        # host, and STT/LLM/TTS multiplex over warm connections
+        self._shared_http = httpx.AsyncClient(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        )
+
+        # One client per provider, shared by both engines (pool reuse)
+        groq_client = AsyncGroq(api_key=groq_key, http_client=self._shared_http)
+        el_client = AsyncElevenLabs(api_key=el_key, httpx_client=self._shared_http)
+
+        # Both engines translate concurrently but share this cap so rapid
+        # turn-taking can't blow through the Groq rate limit
+        groq_semaphore = asyncio.Semaphore(4)
+
         # --- Engine 1: You -> Them (Source -> Target) ---
         self.engine = TranslationEngine(
             api_keys=keys,
@@ -360,7 +463,10 @@ class App(ctk.CTk):
             verbose_callback=lambda m: self.log(f"[You]: {m}"),
             volume_callback=update_meter, # Link Visualizer to Sender Mic
             shared_event=self.speech_interlock, # SHARED
-            engine_name="SENDER"
+            engine_name="SENDER",
+            groq_client=groq_client,
+            el_client=el_client,
+            groq_semaphore=groq_semaphore
         )
         
         # --- Engine 2: Them -> You (Target -> Source) ---
@@ -374,25 +480,50 @@ class App(ctk.CTk):
             verbose_callback=lambda m: self.log(f"[Them]: {m}"),
             volume_callback=None,
             shared_event=self.speech_interlock, # SHARED (If SENDER speaks, RECEIVER deafens)
-            engine_name="RECEIVER"
+            engine_name="RECEIVER",
+            groq_client=groq_client,
+            el_client=el_client,
+            groq_semaphore=groq_semaphore
         )
         
-        # Run async engines in separate threads
-        self.engine_thread = threading.Thread(target=self._run_async_wrapper, args=(self.engine,), daemon=True)
-        self.receiver_thread = threading.Thread(target=self._run_async_wrapper, args=(self.receiver_engine,), daemon=True)
-        
-        self.engine_thread.start()
-        self.receiver_thread.start()
+        # Link engines so either side can cancel the other's in-flight TTS
+        self.engine.peer_engine = self.receiver_engine
+        self.receiver_engine.peer_engine = self.engine
 
-    def _run_async_wrapper(self, engine_instance):
-        asyncio.run(engine_instance.start())
+        # Run both engines on the single shared loop thread as one gathered
+        # coroutine, so they start and finish as a unit
+        self._ensure_loop()
+        self.engines_future = asyncio.run_coroutine_threadsafe(self._run_both(), self._loop)
+
+    async def _run_both(self):
+        await asyncio.gather(self.engine.start(), self.receiver_engine.start())
+
+    def _ensure_loop(self):
+        """Starts the shared asyncio loop thread on first use; reused across sessions."""
+        if self._loop is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._loop_thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
 
     def stop_translation(self):
         if self.engine:
             self.engine.stop()
         if hasattr(self, 'receiver_engine') and self.receiver_engine:
             self.receiver_engine.stop()
-            
+
+        # Close this session's HTTP/2 pool on the loop thread; the next
+        # Start builds a fresh one, and rebinding without aclose() would
+        # leak the old pool's sockets and TLS sessions every cycle
+        http = getattr(self, '_shared_http', None)
+        if http is not None and self._loop is not None:
+            self._shared_http = None
+            asyncio.run_coroutine_threadsafe(http.aclose(), self._loop)
+
         self.log("Stopping All Engines...")
             
         self.btn_start.configure(state="normal", fg_color="green")
@@ -1,23 +1,129 @@
 import asyncio
+import difflib
+import functools
+import io
 import os
+import re
 import time
+import httpx
 import sounddevice as sd
+import soundfile as sf
 import numpy as np
+import webrtcvad
 import logging
-from collections import deque
-from groq import AsyncGroq
+from collections import deque, OrderedDict
+from groq import AsyncGroq, RateLimitError
 from deepgram import AsyncDeepgramClient
 from elevenlabs.client import AsyncElevenLabs
 
+# uvloop roughly halves event-loop overhead, which matters with three
+# long-lived tasks per engine shuffling 30ms audio frames. Not available
+# on Windows, so it stays strictly optional.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Visualizer RMS runs inside the PortAudio callback, so it must not
+# allocate or jitter. numpy-rms does the square-accumulate-sqrt in one
+# fused C/SIMD pass; the einsum fallback likewise fuses square+sum into
+# a single reduction instead of materializing a squared temp array.
+try:
+    from numpy_rms import rms as _np_rms
+
+    def _frame_rms(frame):
+        flat = np.ascontiguousarray(frame.reshape(-1), dtype=np.float32)
+        return float(_np_rms(flat, len(flat))[0])
+except ImportError:
+    def _frame_rms(frame):
+        flat = frame.reshape(-1).astype(np.float32)
+        return float(np.sqrt(np.einsum('i,i->', flat, flat) / flat.size))
+
+# Sentence-boundary flush rules for the streamed LLM -> TTS hand-off
+# (includes Urdu/Arabic and CJK terminators since those are target langs)
+_SENTENCE_END_RE = re.compile(r'[.!?。！？؟۔]\s')
+MIN_SENTENCE_CHARS = 10
+
+
+# Process-wide SDK clients, one per API key. Engines constructed without
+# injected clients (standalone use, scripts) still share warm keep-alive
+# pools and reused TLS sessions instead of re-handshaking per instance.
+@functools.lru_cache(maxsize=None)
+def _get_groq(api_key):
+    return AsyncGroq(api_key=api_key, http_client=httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=100)
+    ))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_elevenlabs(api_key):
+    return AsyncElevenLabs(api_key=api_key, httpx_client=httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=100)
+    ))
+
+class _GroqKeyEntry:
+    __slots__ = ("client", "in_flight", "next_available_ts")
+
+    def __init__(self, client):
+        self.client = client
+        self.in_flight = 0
+        self.next_available_ts = 0.0
+
+
+class _GroqPool:
+    """Rotates translation calls across several Groq API keys.
+
+    Selection is "soonest available, then least in-flight", so a key that
+    just got rate-limited is skipped until its retry window passes and
+    load otherwise spreads evenly. Per-key RPM/TPM caps then scale with
+    the number of keys instead of serializing both engines on one key.
+    """
+
+    def __init__(self, api_keys):
+        self._entries = [_GroqKeyEntry(_get_groq(k)) for k in api_keys]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def pick(self):
+        return min(self._entries, key=lambda e: (e.next_available_ts, e.in_flight))
+
+    def backoff(self, entry, seconds):
+        entry.next_available_ts = time.monotonic() + seconds
+
+
 class TranslationEngine:
-    def __init__(self, api_keys, input_device, output_device, source_lang, target_lang, verbose_callback=None, volume_callback=None, shared_event=None, engine_name="Engine"):
-        self.groq_client = AsyncGroq(api_key=api_keys.get("GROQ_API_KEY"))
-        # self.deepgram_client = AsyncDeepgramClient(api_key=api_keys.get("DEEPGRAM_API_KEY")) # Kept for reference or removal
-        self.elevenlabs_client = AsyncElevenLabs(api_key=api_keys.get("ELEVENLABS_API_KEY"))
+    # Per-target-language voice overrides (lowercase name -> ElevenLabs
+    # voice ID). The default voice is multilingual, so overrides are only
+    # needed where a dedicated voice sounds better.
+    _VOICE_MAP = {}
+    _DEFAULT_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"
+
+    # One gate for ALL ElevenLabs traffic in the process: Scribe and TTS
+    # count against the same plan concurrency (free tier = 2 parallel),
+    # and a 429 there costs a full retry or a lost utterance.
+    _el_concurrency = int(os.getenv("ELEVENLABS_CONCURRENCY", "2"))
+    _tts_semaphore = asyncio.Semaphore(_el_concurrency)
+
+    def __init__(self, api_keys, input_device, output_device, source_lang, target_lang, verbose_callback=None, volume_callback=None, shared_event=None, engine_name="Engine", groq_client=None, el_client=None, groq_semaphore=None):
+        # Prefer injected clients so multiple engines share one connection
+        # pool (one TLS warmup, HTTP/2 multiplexing) instead of two.
+        self.groq_client = groq_client or _get_groq(api_keys.get("GROQ_API_KEY"))
+        self.elevenlabs_client = el_client or _get_elevenlabs(api_keys.get("ELEVENLABS_API_KEY"))
+
+        # Optional streaming STT: with a Deepgram key, raw PCM frames flow
+        # into a persistent live WebSocket and finals arrive as text, which
+        # skips the per-utterance WAV encode + upload of the Scribe path.
+        dg_key = api_keys.get("DEEPGRAM_API_KEY")
+        self.deepgram_client = AsyncDeepgramClient(api_key=dg_key) if dg_key else None
+        self.use_deepgram = self.deepgram_client is not None
         
         self.input_device = input_device
         self.output_device = output_device
@@ -30,16 +136,64 @@ class TranslationEngine:
 
         self.is_running = False
         self.audio_queue = asyncio.Queue()
+        self.text_queue = asyncio.Queue()  # Final transcripts (streaming STT)
+        # SPSC ring for PCM frames bound for Deepgram: deque.append is atomic
+        # in CPython, so the PortAudio thread hands frames off lock-free with
+        # no call_soon_threadsafe hop into the event loop per 30ms frame.
+        # maxlen bounds it to ~15s of audio if the socket stalls.
+        self._dg_frames = deque(maxlen=512)
         self.output_queue = asyncio.Queue()
         self.stop_event = asyncio.Event()
         self.is_playing_audio = False  # Flag for Half-Duplex (Self-Deafening)
-        
+        self.peer_engine = None  # Opposite-direction engine (for barge-in cancel)
+        self._tts_task = None  # In-flight TTS streaming task
+        self._spec_task = None  # Speculative STT on a mid-utterance snapshot
+        self._spec_samples = 0  # Sample count of the snapshot
+        self._spec_utt = 0  # Utterance id the snapshot belongs to
+        self._last_text = ""  # Last accepted transcript (dedupe window)
+        self._last_ts = 0.0
+        # Caps concurrent Groq calls across engines (rate-limit headroom)
+        self.groq_semaphore = groq_semaphore or asyncio.Semaphore(4)
+
+        # Optional multi-key rotation: pass GROQ_API_KEYS (a list) to
+        # spread translation load over several keys' rate limits
+        extra_keys = api_keys.get("GROQ_API_KEYS")
+        self.groq_pool = _GroqPool(extra_keys) if extra_keys else None
+
+        # Higher ElevenLabs tiers can widen the shared gate
+        el_limit = int(api_keys.get("ELEVENLABS_CONCURRENCY") or 0)
+        if el_limit and el_limit != TranslationEngine._el_concurrency:
+            TranslationEngine._el_concurrency = el_limit
+            TranslationEngine._tts_semaphore = asyncio.Semaphore(el_limit)
+
+        # Resolve the TTS voice once; per-utterance lookups are then free
+        self._tts_voice = self._VOICE_MAP.get(target_lang.lower(), self._DEFAULT_VOICE_ID)
+
+        # LRU of synthesized audio keyed by (voice, text). Conversational
+        # filler ("Yes.", "Okay.", greetings) repeats constantly; replaying
+        # cached PCM skips the whole TTS round-trip for those.
+        self._tts_cache = OrderedDict()
+        self._tts_cache_max = 256
+
+        # LRU of finished translations keyed by (source, target, text).
+        # Short filler phrases repeat constantly in conversation; a hit
+        # skips the whole LLM round-trip (and usually hits the TTS cache).
+        self._trans_cache = OrderedDict()
+        self._trans_cache_max = 512
+
         # Audio Settings
         self.samplerate = 16000
         self.channels = 1
-        self.chunk_duration = 5.0 
-        self.chunk_samples = int(self.samplerate * self.chunk_duration)
-        self.silence_threshold = 0.01 
+        self.silence_threshold = 0.01
+
+        # Cache the output device's native rate once. If it refuses 16 kHz we
+        # resample ourselves (vectorized) instead of trusting the host mixer.
+        try:
+            self._out_sr = int(sd.query_devices(output_device)['default_samplerate'])
+        except Exception:
+            self._out_sr = self.samplerate
+        self._resample_needed = False  # Decided when the playback stream opens
+        self._out_stream = None  # Owned by start()/stop(), used by playback
         
         # ISO-639-1 Mapping for ElevenLabs Scribe
         self.lang_map = {
@@ -54,19 +208,109 @@ class TranslationEngine:
         self.is_running = True
         self.loop = asyncio.get_running_loop()
         logger.info(f"Starting Engine: Input={self.input_device}, Output={self.output_device}")
-        
-        # Start Producer, Processor, and Player
-        producer_task = asyncio.create_task(self._audio_producer())
-        processor_task = asyncio.create_task(self._processing_consumer())
-        player_task = asyncio.create_task(self._playback_consumer())
-        
-        await asyncio.gather(producer_task, processor_task, player_task)
+
+        # Open the playback stream up-front so the first utterance doesn't
+        # pay the device-open cost, and keep it open for the whole session.
+        # A refused device must not kill the whole engine: STT/LLM keep
+        # running (the chat log still shows translations) and the failure
+        # is surfaced in the UI instead of dying inside the gather.
+        try:
+            self._open_output_stream()
+        except Exception as e:
+            self._out_stream = None
+            logger.error(f"[{self.engine_name}] Output device open failed: {e}")
+            self._log(f"⚠️ [{self.engine_name}] Output device unavailable ({e}). Running without playback.")
+
+
+        # Start Producer, Processor, and Player (plus a one-shot warmup so
+        # the first utterance doesn't pay the provider TLS handshakes)
+        tasks = [
+            asyncio.create_task(self._audio_producer()),
+            asyncio.create_task(self._processing_consumer()),
+            asyncio.create_task(self._playback_consumer()),
+            asyncio.create_task(self._warmup()),
+        ]
+        if self.use_deepgram:
+            tasks.append(asyncio.create_task(self._deepgram_listener()))
+
+        await asyncio.gather(*tasks)
 
     def stop(self):
         """Stops the engine."""
         self.is_running = False
+        # Wake consumers suspended on queue.get() (set on the loop thread)
+        loop = getattr(self, "loop", None)
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self.stop_event.set)
+        if self._out_stream is not None:
+            try:
+                self._out_stream.close()
+            except Exception:
+                pass
+            self._out_stream = None
         logger.info("Stopping Engine...")
 
+    def _open_output_stream(self):
+        """Opens the persistent playback stream (16 kHz, int16, mono)."""
+        try:
+            self._out_stream = sd.RawOutputStream(
+                samplerate=self.samplerate,
+                channels=1,
+                dtype='int16',
+                device=self.output_device,
+                blocksize=1024
+            )
+            self._resample_needed = False
+        except Exception:
+            # Device won't run at 16 kHz: open at its native rate and
+            # upsample chunks ourselves rather than relying on whatever
+            # the host mixer does
+            logger.info(f"[{self.engine_name}] 16kHz unsupported; playing at {self._out_sr}Hz with resampling.")
+            self._out_stream = sd.RawOutputStream(
+                samplerate=self._out_sr,
+                channels=1,
+                dtype='int16',
+                device=self.output_device,
+                blocksize=1024
+            )
+            self._resample_needed = self._out_sr != self.samplerate
+        self._out_stream.start()
+
+    async def _warmup(self):
+        """Pre-warms the provider connections (DNS + TLS + HTTP/2 SETTINGS).
+
+        The handshakes cost ~300-1000ms per provider and would otherwise
+        land on the first utterance. Each probe is as cheap as the API
+        allows and failures are ignored - warmup is best-effort.
+        """
+        async def warm_groq():
+            try:
+                async with self.groq_semaphore:
+                    await self.groq_client.chat.completions.create(
+                        messages=[{"role": "user", "content": "hi"}],
+                        model="llama-3.1-8b-instant",
+                        max_tokens=1
+                    )
+            except Exception as e:
+                logger.debug(f"Groq warmup skipped: {e}")
+
+        async def warm_scribe():
+            try:
+                silence = np.zeros(int(0.1 * self.samplerate), dtype=np.int16)
+                await self._transcribe(silence)
+            except Exception as e:
+                logger.debug(f"Scribe warmup skipped: {e}")
+
+        async def warm_tts():
+            try:
+                async for _ in self._text_to_speech("hi"):
+                    pass
+            except Exception as e:
+                logger.debug(f"TTS warmup skipped: {e}")
+
+        await asyncio.gather(warm_groq(), warm_scribe(), warm_tts())
+        logger.info(f"[{self.engine_name}] Connection warmup complete.")
+
     def _log(self, message):
         if self.verbose_callback:
             self.verbose_callback(message)
@@ -74,77 +318,174 @@ class TranslationEngine:
 
     async def _audio_producer(self):
         """Step A: Capture Audio with VAD (Voice Activity Detection)."""
-        loop = asyncio.get_event_loop()
-        import webrtcvad
-        
         vad = webrtcvad.Vad(3) # Mode 3: Very Aggressive (Filters background noise)
         frame_duration_ms = 30
         frame_samples = int(self.samplerate * frame_duration_ms / 1000) # 480 samples
+        # is_speech accepts exactly 10/20/30ms of 16-bit mono; blocksize is
+        # pinned to 30ms below, so validate once here instead of wrapping
+        # every frame in a try/except. Pre-bound to skip the attribute
+        # lookup 33x/s in the callback.
+        assert frame_samples * 2 == 960, "VAD frames must be 30ms of 16-bit mono at 16kHz"
+        vad_is_speech = vad.is_speech
+        # silence_threshold is on the float scale; capture is int16 now
+        silence_gate = int(self.silence_threshold * 32768)
         
         # VAD State
         triggered = False
-        buffer = []
         silence_counter = 0
-        SUCCESSIVE_SILENCE_LIMIT = int(1000 / frame_duration_ms) # 1 sec of silence to stop
-        
+        partial_sent = False
+        # Monotonic utterance id, stamped on every partial/final so the
+        # consumer never pairs a speculative snapshot with the wrong
+        # utterance (an interlock reset can orphan a snapshot mid-speech)
+        utt_id = 0
+        SUCCESSIVE_SILENCE_LIMIT = int(500 / frame_duration_ms) # 500ms of silence to flush
+        PARTIAL_TRIGGER_SAMPLES = int(1.5 * self.samplerate) # Speculative STT snapshot point
+
+        # Preallocated utterance ring: frames land in one contiguous int16
+        # block instead of ~30 list appends per second plus a concatenate
+        # at flush. 30s cap; an utterance that long is force-flushed.
+        ring = np.empty(self.samplerate * 30, dtype=np.int16)
+        ring_w = 0
+
+        def write_frame(frame):
+            nonlocal ring_w
+            flat = frame.reshape(-1)
+            end = ring_w + flat.size
+            if end > ring.size:
+                return False
+            ring[ring_w:end] = flat
+            ring_w = end
+            return True
+        # Pre-roll: keep ~200ms of audio from before the VAD triggers so
+        # utterance onsets aren't clipped
+        preroll = deque(maxlen=max(1, int(200 / frame_duration_ms)))
+
+        # PortAudio -> loop handoff: the realtime callback only copies the
+        # frame and appends (atomic in CPython); RMS, VAD and buffering run
+        # in the event loop where an occasional stall can't drop frames.
+        # maxlen bounds it to ~8s if the loop wedges.
+        frames_in = deque(maxlen=256)
+
+        # Pre-bound hot names: process_frame runs 33x/s per engine and
+        # these never change over a session, so skip the LOAD_ATTR dict
+        # lookups per frame. Mutable flags (is_running, is_playing_audio,
+        # use_deepgram) stay attribute reads so updates are seen.
+        volume_cb = self.volume_callback
+        verbose_cb = self.verbose_callback
+        shared_event = self.shared_event
+        samplerate = self.samplerate
+        dg_frames = self._dg_frames
+        audio_put = self.audio_queue.put_nowait
+        msg_start = f"[{self.engine_name}] Speech Detected..."
+        msg_end = f"[{self.engine_name}] End of Speech. Processing..."
+
         def callback(indata, frames, time_info, status):
-            nonlocal triggered, silence_counter, buffer
-            if status:
-                pass
-            
+            if self.is_running:
+                frames_in.append(indata.copy())
+
+        def process_frame(audio_int16):
+            nonlocal triggered, silence_counter, ring_w, partial_sent, utt_id
+
             # VISUALIZER UPDATE
-            if self.volume_callback:
-                rms = np.sqrt(np.mean(indata**2))
+            if volume_cb:
+                rms = _frame_rms(audio_int16) / 32768.0
                 # Normalize reasonably (mic input is usually low)
-                level = min(rms * 5, 1.0) 
-                loop.call_soon_threadsafe(self.volume_callback, level)
+                level = min(rms * 5, 1.0)
+                volume_cb(level)
 
             # GLOBAL INTERLOCK: If ANY engine is speaking (shared_event set), DON'T LISTEN.
-            if self.shared_event and self.shared_event.is_set():
+            if shared_event and shared_event.is_set():
                 triggered = False
-                buffer = []
+                ring_w = 0
                 silence_counter = 0
+                partial_sent = False
+                preroll.clear()
                 return
-            
+
             # SELF-DEAFENING: (Fallback)
             if self.is_playing_audio:
                 triggered = False
-                buffer = []
+                ring_w = 0
                 silence_counter = 0
+                partial_sent = False
+                preroll.clear()
                 return
 
-            if self.is_running:
-                # Convert float32 -> int16 bytes for WebRTCVAD
-                audio_int16 = (indata * 32767).astype(np.int16)
-                audio_bytes = audio_int16.tobytes()
-                
-                try:
-                    is_speech = vad.is_speech(audio_bytes, self.samplerate)
-                except:
-                    is_speech = False
-                
-                if is_speech:
-                    if not triggered:
-                        triggered = True
-                        if self.verbose_callback:
-                            loop.call_soon_threadsafe(self.verbose_callback, f"[{self.engine_name}] Speech Detected...")
-                    silence_counter = 0
-                    buffer.append(indata.copy())
-                else:
-                    if triggered:
-                        silence_counter += 1
-                        buffer.append(indata.copy()) # Keep padding
-                        
-                        if silence_counter > SUCCESSIVE_SILENCE_LIMIT:
-                            triggered = False
-                            # Flush buffer
-                            if buffer:
-                                full_audio = np.concatenate(buffer)
-                                loop.call_soon_threadsafe(self.audio_queue.put_nowait, full_audio)
-                            buffer = []
-                            silence_counter = 0
-                            if self.verbose_callback:
-                                loop.call_soon_threadsafe(self.verbose_callback, f"[{self.engine_name}] End of Speech. Processing...")
+            # Capture is already int16 (see InputStream dtype), so the
+            # bytes go straight to the VAD with no float conversion
+            audio_bytes = audio_int16.tobytes()
+
+            # Streaming STT: ship every frame to the live socket and let
+            # Deepgram's endpointing do the segmentation
+            if self.use_deepgram:
+                dg_frames.append(audio_bytes)
+                return
+
+            # Cheap noise gate: a frame whose peak is below the silence
+            # threshold can't contain speech, so skip the VAD call. Two
+            # SIMD reductions - no sqrt, no temporary arrays.
+            if not triggered and audio_int16.max() < silence_gate and audio_int16.min() > -silence_gate:
+                preroll.append(audio_int16)
+                return
+
+            is_speech = vad_is_speech(audio_bytes, samplerate)
+
+            if is_speech:
+                if not triggered:
+                    triggered = True
+                    ring_w = 0
+                    utt_id += 1
+                    # Prepend the pre-roll so the first syllable survives
+                    for f in preroll:
+                        write_frame(f)
+                    preroll.clear()
+                    if verbose_cb:
+                        verbose_cb(msg_start)
+                silence_counter = 0
+                # The frame goes straight into the preallocated ring:
+                # no per-frame allocation, one contiguous slice at flush
+                if not write_frame(audio_int16):
+                    # 30s cap hit: flush what we have rather than stall
+                    audio_put(("final", utt_id, ring[:ring_w].copy()))
+                    triggered = False
+                    ring_w = 0
+                    partial_sent = False
+                    return
+                # Speculative STT: once ~1.5s of speech has accumulated,
+                # ship a snapshot so transcription overlaps the tail of
+                # the utterance. The consumer reuses the result if the
+                # final segment barely grew past the snapshot.
+                if not partial_sent and ring_w >= PARTIAL_TRIGGER_SAMPLES:
+                    partial_sent = True
+                    audio_put(("partial", utt_id, ring[:ring_w].copy()))
+            else:
+                if not triggered:
+                    preroll.append(audio_int16)
+                if triggered:
+                    silence_counter += 1
+                    write_frame(audio_int16) # Keep padding
+
+                    if silence_counter > SUCCESSIVE_SILENCE_LIMIT:
+                        triggered = False
+                        # Flush the ring in one slice
+                        if ring_w:
+                            audio_put(("final", utt_id, ring[:ring_w].copy()))
+                        ring_w = 0
+                        silence_counter = 0
+                        partial_sent = False
+                        if verbose_cb:
+                            verbose_cb(msg_end)
+
+        async def vad_worker():
+            # Drains whatever frames have accumulated each pass; 10ms idle
+            # sleep is a third of a frame period, so added latency is
+            # negligible next to the 500ms end-of-speech window
+            while self.is_running:
+                if not frames_in:
+                    await asyncio.sleep(0.01)
+                    continue
+                for _ in range(len(frames_in)):
+                    process_frame(frames_in.popleft())
 
         try:
             logger.info(f"Audio Capture Started on Device: {self.input_device}")
@@ -152,32 +493,149 @@ class TranslationEngine:
                 device=self.input_device,
                 channels=self.channels,
                 samplerate=self.samplerate,
+                dtype='int16',  # VAD and STT both want int16; skip float32
                 callback=callback,
                 blocksize=frame_samples # 30ms frames
             )
             with stream:
-                while self.is_running:
-                    await asyncio.sleep(0.1)
+                await vad_worker()
         except Exception as e:
             logger.error(f"Audio Capture Failed: {e}")
+            self._log(f"⚠️ [{self.engine_name}] Audio capture failed: {e}")
+            # Mark the engine dead BEFORE waking the consumers: with
+            # stop_event set but is_running still True, _get_or_stop would
+            # return None instantly and the consumer loops would spin hot
+            self.is_running = False
             self.stop_event.set()
 
+    async def _deepgram_listener(self):
+        """Persistent Deepgram live socket: sends PCM frames, queues finals."""
+        try:
+            from deepgram import LiveOptions, LiveTranscriptionEvents
+        except ImportError as e:
+            logger.error(f"Deepgram SDK unavailable ({e}). Falling back to Scribe STT.")
+            self._fall_back_to_scribe()
+            return
+
+        try:
+            dg_connection = self.deepgram_client.listen.asynclive.v("1")
+
+            async def on_transcript(client, result, **kwargs):
+                try:
+                    transcript = result.channel.alternatives[0].transcript
+                except (AttributeError, IndexError):
+                    return
+                if getattr(result, "is_final", False) and transcript.strip():
+                    self.text_queue.put_nowait(transcript.strip())
+
+            dg_connection.on(LiveTranscriptionEvents.Transcript, on_transcript)
+
+            options = LiveOptions(
+                model="nova-2",
+                language=self.lang_map.get(self.source_lang, "en"),
+                encoding="linear16",
+                sample_rate=self.samplerate,
+                channels=self.channels,
+                interim_results=False,
+                utterance_end_ms="1500",
+                endpointing=300
+            )
+            await dg_connection.start(options)
+            logger.info(f"[{self.engine_name}] Deepgram live STT connected.")
+
+            frames = self._dg_frames
+            while self.is_running:
+                if not frames:
+                    await asyncio.sleep(0.02)
+                    continue
+                # Drain whatever has accumulated in one send batch
+                await dg_connection.send(b"".join(frames.popleft() for _ in range(len(frames))))
+
+            await dg_connection.finish()
+        except Exception as e:
+            logger.error(f"Deepgram stream failed: {e}. Falling back to Scribe STT.")
+            self._fall_back_to_scribe()
+
+    def _fall_back_to_scribe(self):
+        """Switches STT to the Scribe path after a Deepgram failure.
+
+        The consumer may be suspended on text_queue at this point, so a
+        None sentinel is posted to wake it; it re-checks use_deepgram at
+        the top of its loop and starts draining audio_queue instead.
+        """
+        self.use_deepgram = False
+        self.text_queue.put_nowait(None)
+
+    async def _get_or_stop(self, queue):
+        """Suspends on queue.get(), waking early if stop_event fires.
+
+        Returns the queued item, or None on shutdown. Event-driven: no
+        polling interval between a producer posting and the consumer
+        running, and no wakeups while both are idle.
+        """
+        get_task = asyncio.create_task(queue.get())
+        stop_task = asyncio.create_task(self.stop_event.wait())
+        done, pending = await asyncio.wait(
+            {get_task, stop_task}, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+        if get_task in done:
+            return get_task.result()
+        return None
+
     async def _processing_consumer(self):
         """Step B: Process Audio (STT -> LLM -> TTS)."""
         while self.is_running:
             try:
-                # Wait for VAD-segmented audio chunk
-                if self.audio_queue.empty():
-                    await asyncio.sleep(0.05)
-                    continue
-                
-                audio_data = await self.audio_queue.get()
-                
+                audio_data = None
+                if self.use_deepgram:
+                    # Finals arrive pre-transcribed from the live socket
+                    text = await self._get_or_stop(self.text_queue)
+                    if text is None:
+                        # Either shutdown or the Deepgram-fallback sentinel;
+                        # breaking on stop_event avoids re-entering the wait
+                        if self.stop_event.is_set():
+                            break
+                        continue
+                else:
+                    # Wait for VAD-segmented audio chunk
+                    item = await self._get_or_stop(self.audio_queue)
+                    if item is None:
+                        if self.stop_event.is_set():
+                            break
+                        continue
+                    kind, utt, audio_data = item
+                    if kind == "partial":
+                        # Start STT on the mid-utterance snapshot now; the
+                        # network round-trip overlaps the speech tail
+                        if self._spec_task and not self._spec_task.done():
+                            self._spec_task.cancel()
+                        self._spec_samples = len(audio_data)
+                        self._spec_utt = utt
+                        self._spec_task = asyncio.create_task(self._transcribe(audio_data))
+                        continue
+
+                    # Coalesce: a mid-sentence pause splits one sentence into
+                    # several segments, each paying its own STT+LLM+TTS
+                    # round-trips. Merge anything that arrives within 300ms,
+                    # capped at ~8s to keep the upload bounded.
+                    max_coalesced = 8 * self.samplerate
+                    while len(audio_data) < max_coalesced:
+                        try:
+                            nk, _, extra = await asyncio.wait_for(self.audio_queue.get(), timeout=0.3)
+                        except asyncio.TimeoutError:
+                            break
+                        if nk == "partial":
+                            continue  # Snapshot of a segment being merged anyway
+                        audio_data = np.concatenate([audio_data, extra])
+
                 # --- PROCESS AUDIO ---
                 try:
                     start_time = time.time()
-                    
-                    text = await self._transcribe(audio_data)
+
+                    if audio_data is not None:
+                        text = await self._transcribe_final(audio_data, utt)
                     
                     # Robust Filtering
                     ignored_phrases = [
@@ -189,33 +647,51 @@ class TranslationEngine:
                     if (not text 
                         or len(clean_text) < 2 
                         or clean_text in ignored_phrases
-                        or clean_text.startswith("(") 
+                        or clean_text.startswith("(")
                     ):
                         continue
-                    
+
+                    # Dedupe: aggressive VAD around a mid-sentence pause can
+                    # emit the same phrase twice; a near-match inside 4s
+                    # would cost a redundant LLM+TTS round-trip
+                    now = time.time()
+                    if (self._last_text
+                        and now - self._last_ts < 4
+                        and difflib.SequenceMatcher(None, clean_text, self._last_text).ratio() > 0.9
+                    ):
+                        logger.info(f"[{self.engine_name}] Duplicate utterance dropped: '{clean_text[:40]}'")
+                        continue
+                    self._last_text = clean_text
+                    self._last_ts = now
+
                     t_transcribe = time.time()
                     
-                    translated_text = await self._translate(text)
+                    # --- STREAMING LLM -> TTS PIPELINE ---
+                    # The translation is streamed and every completed sentence
+                    # goes to TTS while later tokens are still generating.
+                    # Runs as a cancellable subtask so the peer engine can
+                    # abort the whole utterance mid-stream on barge-in.
+                    translated_parts = []
+                    self._tts_task = asyncio.create_task(
+                        self._pipeline_translate_tts(text, translated_parts, t_transcribe)
+                    )
+                    try:
+                        await self._tts_task
+                    except asyncio.CancelledError:
+                        logger.info(f"[{self.engine_name}] Utterance cancelled (barge-in).")
+                        continue
+                    finally:
+                        self._tts_task = None
+
+                    translated_text = " ".join(translated_parts).strip()
                     if not translated_text:
                         continue
-                    t_translate = time.time()
-                    
-                    # Log messages (Show user it's starting)
+
+                    # Log messages (the chat UI parses this line)
                     if self.verbose_callback:
                         self.verbose_callback(f"Original: {text} -> Translated: {translated_text}")
                     logger.info(f"[{self.engine_name}] Original: {text} -> Translated: {translated_text}")
-                    
-                     # --- STREAMING TTS PIPELINE ---
-                    tts_start = time.time()
-                    first_chunk = True
-                    
-                    async for chunk in self._text_to_speech(translated_text):
-                        await self.output_queue.put(chunk)
-                        if first_chunk:
-                             first_chunk = False
-                             tts_latency = (time.time() - t_translate) * 1000
-                             logger.info(f"[{self.engine_name}] TTS First Byte: {int(tts_latency)}ms")
-    
+
                     total_time = (time.time() - start_time) * 1000
                     logger.info(f"[{self.engine_name}] Pipeline Total: {int(total_time)}ms")
                     
@@ -228,63 +704,150 @@ class TranslationEngine:
                 logger.error(f"Critical Pipeline Error: {e}")
                 await asyncio.sleep(5)
 
+    async def _stream_tts_to_queue(self, text, t_ref):
+        """Streams TTS audio for one sentence into the output queue."""
+        first_chunk = True
+        async for chunk in self._text_to_speech(text):
+            await self.output_queue.put(chunk)
+            if first_chunk:
+                first_chunk = False
+                tts_latency = (time.time() - t_ref) * 1000
+                logger.info(f"[{self.engine_name}] TTS First Byte: {int(tts_latency)}ms")
+
+    def cancel_current_tts(self):
+        """Aborts any in-flight TTS stream and drops queued, unplayed audio.
+
+        Called by the peer engine (same loop) when it starts speaking, so the
+        barge-in produces immediate silence instead of draining the buffer.
+        """
+        task = self._tts_task
+        if task is not None and not task.done():
+            task.cancel()
+        while not self.output_queue.empty():
+            try:
+                self.output_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+
     async def _playback_consumer(self):
-        """Consumes PCM audio chunks and plays them via RawOutputStream."""
-        import sounddevice as sd
-        
-        # Open a Persistent Stream for Low Latency
+        """Consumes PCM audio chunks and plays them via RawOutputStream.
+
+        The stream itself lives for the whole session and is owned by
+        start()/stop(); this consumer only writes to it.
+        """
         try:
-            stream = sd.RawOutputStream(
-                samplerate=16000, 
-                channels=1, 
-                dtype='int16', 
-                device=self.output_device,
-                blocksize=1024
-            )
-            
-            with stream:
+            stream = self._out_stream
+            if stream is None:
+                # No output device: keep draining so TTS chunks don't pile
+                # up in the queue for the rest of the session
                 while self.is_running:
-                    if self.output_queue.empty():
-                        await asyncio.sleep(0.05)
-                        continue
+                    try:
+                        await asyncio.wait_for(self.output_queue.get(), timeout=0.5)
+                    except asyncio.TimeoutError:
+                        pass
+                return
+            while self.is_running:
+                # Suspend until the first chunk of an utterance arrives:
+                # no polling floor between TTS first byte and the speaker.
+                # The timeout only exists so shutdown is noticed.
+                try:
+                    chunk_bytes = await asyncio.wait_for(self.output_queue.get(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    continue
+
+                # Mute Microphone (Half-Duplex)
+                self.is_playing_audio = True
+                if self.shared_event:
+                    self.shared_event.set() # SIGNAL GLOBAL MUTE
+                # Barge-in: the other direction stops talking immediately
+                if self.peer_engine:
+                    self.peer_engine.cancel_current_tts()
 
-                    # Mute Microphone (Half-Duplex)
-                    self.is_playing_audio = True
+                try:
+                    carry = b""  # Holds a split sample across chunk edges
+                    while True:
+                        if chunk_bytes:
+                            # RawOutputStream takes the PCM bytes directly;
+                            # no numpy round-trip. Writes must be whole
+                            # int16 frames, so carry any odd byte over.
+                            data = carry + chunk_bytes
+                            if len(data) & 1:
+                                carry = data[-1:]
+                                data = data[:-1]
+                            else:
+                                carry = b""
+                            if data:
+                                if self._resample_needed:
+                                    data = self._resample_pcm(data)
+                                stream.write(data)
+                        # End of utterance = no follow-up chunk within
+                        # 300ms; that gap also lets the device buffer drain
+                        try:
+                            chunk_bytes = await asyncio.wait_for(self.output_queue.get(), timeout=0.3)
+                        except asyncio.TimeoutError:
+                            break
+
+                finally:
+                    self.is_playing_audio = False
                     if self.shared_event:
-                        self.shared_event.set() # SIGNAL GLOBAL MUTE
-                    
-                    try:
-                        while not self.output_queue.empty():
-                            chunk_bytes = await self.output_queue.get()
-                            if chunk_bytes:
-                                # Convert raw bytes to numpy Int16 array for sounddevice
-                                chunk_np = np.frombuffer(chunk_bytes, dtype=np.int16)
-                                stream.write(chunk_np)
-                        
-                        # Small buffer drain time
-                        await asyncio.sleep(0.1)
-                        
-                    finally:
-                        self.is_playing_audio = False
-                        if self.shared_event:
-                            self.shared_event.clear() # UNMUTE
-                    
+                        self.shared_event.clear() # UNMUTE
+
         except Exception as e:
             logger.error(f"Playback Stream Error: {e}")
             self.is_playing_audio = False
             if self.shared_event:
                 self.shared_event.clear()
 
+    def _resample_pcm(self, data_bytes):
+        """Linear-resamples int16 PCM from 16 kHz to the device rate."""
+        x = np.frombuffer(data_bytes, dtype=np.int16)
+        n_out = int(len(x) * self._out_sr / self.samplerate)
+        out = np.interp(
+            np.linspace(0, len(x) - 1, n_out),
+            np.arange(len(x)),
+            x.astype(np.float32)
+        )
+        return out.astype(np.int16).tobytes()
+
+    async def _transcribe_final(self, audio_data, utt):
+        """Resolves STT for a final segment, reusing the speculative task.
+
+        If the utterance ended just after the snapshot (short phrases - the
+        common case), the already-in-flight transcript is awaited instead
+        of paying a fresh STT round-trip; ~500ms of the growth is the VAD's
+        silence padding, so the reuse window forfeits at most ~100ms of
+        trailing speech. The snapshot must carry the same utterance id and
+        must not be longer than the final - an interlock reset can orphan
+        a snapshot whose final never arrives, and reusing it would speak
+        the aborted utterance's words. Mismatches are cancelled.
+        """
+        spec, self._spec_task = self._spec_task, None
+        if spec is not None:
+            growth = len(audio_data) - self._spec_samples
+            if utt == self._spec_utt and 0 <= growth <= int(0.6 * self.samplerate):
+                try:
+                    return await spec
+                except Exception:
+                    pass
+            else:
+                spec.cancel()
+        return await self._transcribe(audio_data)
+
     async def _transcribe(self, audio_data):
         """Step B: Transcribe audio using Groq Whisper."""
         try:
-            import io
-            import soundfile as sf
-            
-            buffer = io.BytesIO()
-            sf.write(buffer, audio_data, self.samplerate, format='WAV')
-            buffer.name = 'audio.wav' 
-            buffer.seek(0)
+            def encode():
+                buf = io.BytesIO()
+                # FLAC (PCM_16) instead of WAV: lossless, but roughly a third
+                # of the bytes on the wire for a typical speech segment
+                sf.write(buf, audio_data, self.samplerate, format='FLAC', subtype='PCM_16')
+                buf.name = 'audio.flac'
+                buf.seek(0)
+                return buf
+
+            # FLAC compression is tens of ms of pure CPU for a long segment;
+            # run it off-loop so audio capture and playback stay responsive
+            buffer = await asyncio.to_thread(encode)
             
             # Resolve language code
             lang_code = self.lang_map.get(self.source_lang, "en")
@@ -292,12 +855,13 @@ class TranslationEngine:
             # Use ElevenLabs Scribe (Speech to Text)
             # Model: scribe_v1
             # Optimization: Tag Audio Events False to remove (traffic noises)
-            transcript = await self.elevenlabs_client.speech_to_text.convert(
-                file=buffer,
-                model_id="scribe_v1",
-                language_code=lang_code,
-                tag_audio_events=False
-            )
+            async with TranslationEngine._tts_semaphore:
+                transcript = await self.elevenlabs_client.speech_to_text.convert(
+                    file=buffer,
+                    model_id="scribe_v1",
+                    language_code=lang_code,
+                    tag_audio_events=False
+                )
             
             # Ensure we extract text properly (transcript is likely an object)
             return transcript.text.strip()
@@ -305,41 +869,139 @@ class TranslationEngine:
             logger.error(f"Transcription failed: {e}")
             return None
 
-    async def _translate(self, text):
-        """Step C: Translate text using Groq Llama 3."""
-        try:
-            chat_completion = await self.groq_client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are a professional translator. Output only JSON: {\"translation\": \"...\"}"}, 
-                    {"role": "user", "content": f"Translate to {self.target_lang}: {text}"}
-                ],
-                model="llama-3.1-8b-instant",
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
-            
-            import json
-            content = chat_completion.choices[0].message.content
-            data = json.loads(content)
-            return data.get("translation", "")
-        except Exception as e:
-            logger.error(f"Translation failed: {e}")
-            return text 
+    async def _pipeline_translate_tts(self, text, out_sentences, t_ref):
+        """Step C+D fused: streams the Groq translation and hands each
+        completed sentence to TTS while later tokens still generate.
+
+        Completed sentences are appended to out_sentences so the caller can
+        log the full translation afterwards.
+        """
+        cache_key = (self.source_lang, self.target_lang, text.strip().lower())
+        cached = self._trans_cache.get(cache_key)
+        if cached is not None:
+            self._trans_cache.move_to_end(cache_key)
+            logger.info(f"[{self.engine_name}] Translation cache hit: '{text[:40]}'")
+            for sentence in cached:
+                out_sentences.append(sentence)
+                await self._stream_tts_to_queue(sentence, t_ref)
+            return
+
+        # Plain-text output: JSON mode would disable useful streaming and
+        # cost ~10 wrapper tokens of decode latency per reply. The short
+        # system prompt keeps prefill cost down.
+        messages = [
+            {"role": "system", "content": "Output only the translated text."},
+            {"role": "user", "content": f"Translate to {self.target_lang}: {text}"}
+        ]
+        # Decode time is roughly linear in output tokens; cap generation at
+        # a generous multiple of the source length so a runaway reply can't
+        # stall the pipeline, with headroom for script expansion
+        max_tokens = min(256, max(48, 4 * len(text.split()) + 20))
+        buffer = ""
+        async with self.groq_semaphore:
+            completion, lease = await self._start_translation_stream(messages, max_tokens)
+            try:
+                async for chunk in completion:
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    buffer += delta
+                    match = _SENTENCE_END_RE.search(buffer)
+                    if match and match.end() >= MIN_SENTENCE_CHARS:
+                        sentence = buffer[:match.end()].strip()
+                        buffer = buffer[match.end():]
+                        out_sentences.append(sentence)
+                        # Sequential per sentence keeps playback order; tokens
+                        # keep accumulating server-side in the meantime
+                        await self._stream_tts_to_queue(sentence, t_ref)
+            finally:
+                if lease is not None:
+                    lease.in_flight -= 1
+
+        if buffer.strip():
+            sentence = buffer.strip()
+            out_sentences.append(sentence)
+            await self._stream_tts_to_queue(sentence, t_ref)
+
+        if out_sentences:
+            self._trans_cache[cache_key] = tuple(out_sentences)
+            if len(self._trans_cache) > self._trans_cache_max:
+                self._trans_cache.popitem(last=False)
+
+    async def _start_translation_stream(self, messages, max_tokens):
+        """Opens the streaming Groq completion, rotating across pooled keys.
+
+        Returns (completion, lease). Without a pool the lease is None;
+        with one, the caller decrements lease.in_flight once the stream
+        is fully consumed. A rate-limited key is put on backoff for its
+        Retry-After window and the next-best key is tried.
+        """
+        kwargs = dict(
+            messages=messages,
+            model="llama-3.1-8b-instant",
+            temperature=0.1,
+            max_tokens=max_tokens,
+            stop=["\n\n"],
+            stream=True
+        )
+        if self.groq_pool is None:
+            return await self.groq_client.chat.completions.create(**kwargs), None
+
+        last_err = None
+        for _ in range(len(self.groq_pool)):
+            entry = self.groq_pool.pick()
+            entry.in_flight += 1
+            try:
+                return await entry.client.chat.completions.create(**kwargs), entry
+            except RateLimitError as e:
+                entry.in_flight -= 1
+                retry_after = 2.0
+                try:
+                    retry_after = float(e.response.headers.get("retry-after", retry_after))
+                except Exception:
+                    pass
+                self.groq_pool.backoff(entry, retry_after)
+                logger.warning(f"[{self.engine_name}] Groq key rate-limited; backing off {retry_after:.1f}s, rotating.")
+                last_err = e
+            except BaseException:
+                # No stream was returned, so the caller's finally never
+                # runs - release the slot here or the key stays
+                # deprioritized forever on a bogus in-flight count
+                entry.in_flight -= 1
+                raise
+        raise last_err
 
     async def _text_to_speech(self, text):
         """Step D: AES (Audio Stream Generation) - PCM 16kHz."""
+        cache_key = (self._tts_voice, text)
+        cached = self._tts_cache.get(cache_key)
+        if cached is not None:
+            self._tts_cache.move_to_end(cache_key)
+            logger.info(f"[{self.engine_name}] TTS cache hit: '{text[:40]}'")
+            yield cached
+            return
+
         try:
-            # Use 'pcm_16000' for raw playback without decoding overhead
-            audio_stream = self.elevenlabs_client.text_to_speech.convert(
-                text=text,
-                voice_id="21m00Tcm4TlvDq8ikWAM",
-                model_id="eleven_turbo_v2_5",
-                output_format="pcm_16000"
-            )
-            
-            async for chunk in audio_stream:
-                if chunk:
-                    yield chunk
+            async with TranslationEngine._tts_semaphore:
+                # Use 'pcm_16000' for raw playback without decoding overhead
+                audio_stream = self.elevenlabs_client.text_to_speech.convert(
+                    text=text,
+                    voice_id=self._tts_voice,
+                    model_id="eleven_turbo_v2_5",
+                    output_format="pcm_16000"
+                )
+
+                # Accumulate while streaming so a complete utterance can be cached
+                parts = []
+                async for chunk in audio_stream:
+                    if chunk:
+                        parts.append(chunk)
+                        yield chunk
+
+                if parts:
+                    self._tts_cache[cache_key] = b"".join(parts)
+                    if len(self._tts_cache) > self._tts_cache_max:
+                        self._tts_cache.popitem(last=False)
 
         except Exception as e:
             logger.error(f"TTS Stream failed: {e}")